@@ -1,8 +1,12 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, File, UploadFile, Query, Request, Header, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+from pymongo.errors import ConnectionFailure, OperationFailure, PyMongoError
 from fastapi.staticfiles import StaticFiles
 import os
 import logging
@@ -14,21 +18,91 @@ from datetime import datetime
 from enum import Enum
 import aiofiles
 import shutil
+import asyncio
+import json
+import bisect
+import heapq
+import unicodedata
+import time
+import math
+import ipaddress
+from collections import deque
+from contextlib import asynccontextmanager
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection (o cliente é criado no lifespan da aplicação)
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+db_name = os.environ['DB_NAME']
+mongo_options = {
+    "maxPoolSize": int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+    "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', '10')),
+    "connectTimeoutMS": int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '5000')),
+    "serverSelectionTimeoutMS": int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+    "socketTimeoutMS": int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '20000')),
+}
+# Leituras do catálogo podem ir para secundários; escritas e leituras após escrita usam o primário
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+def parse_read_preference(nome: str):
+    """Converte o nome de modo do MongoDB (ex.: secondaryPreferred); falha em valores desconhecidos"""
+    try:
+        return READ_PREFERENCES[nome.strip()]
+    except KeyError:
+        raise ValueError(
+            f"MONGO_CATALOG_READ_PREFERENCE inválido: {nome!r}; use um de {', '.join(READ_PREFERENCES)}"
+        ) from None
+
+catalog_read_preference = parse_read_preference(
+    os.environ.get('MONGO_CATALOG_READ_PREFERENCE', 'primaryPreferred')
+)
+client: Optional[AsyncIOMotorClient] = None
+db = None
+catalog_db = None
 
 # Create uploads directory
 uploads_dir = ROOT_DIR / "uploads"
 uploads_dir.mkdir(exist_ok=True)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global client, db, catalog_db
+    if not limitar_por_ip:
+        logger.warning(
+            "Limites por IP desativados: defina TRUSTED_PROXIES com os endereços do ingress "
+            "ou RATE_LIMIT_BY_IP=on se a API recebe os clientes diretamente"
+        )
+    client = AsyncIOMotorClient(mongo_url, **mongo_options)
+    db = client[db_name]
+    catalog_db = client.get_database(db_name, read_preference=catalog_read_preference)
+
+    app.state.pronto = False
+    app.state.erros_aquecimento = {}
+    app.state.aquecimento = asyncio.create_task(warm_up(app))
+    app.state.radio_watcher = asyncio.create_task(watch_radio_changes())
+    # Só começa a aceitar requisições depois de aquecer, salvo se o Mongo estiver fora
+    await asyncio.wait({app.state.aquecimento}, timeout=float(os.environ.get('WARMUP_TIMEOUT_S', '15')))
+
+    yield
+
+    # Espera as tasks encerrarem antes de fechar o cliente que elas ainda usam
+    tarefas = [app.state.aquecimento, app.state.radio_watcher]
+    if suggestion_index.recarga is not None:
+        tarefas.append(suggestion_index.recarga)
+    for tarefa in tarefas:
+        tarefa.cancel()
+    await asyncio.gather(*tarefas, return_exceptions=True)
+    client.close()
+
 # Create the main app
-app = FastAPI(title="mobinabert PLAY - Plataforma de Rádios", version="1.0.0")
+app = FastAPI(title="mobinabert PLAY - Plataforma de Rádios", version="1.0.0", lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -126,6 +200,18 @@ class RadioFilters(BaseModel):
     estado: Optional[str] = None
     ativo: Optional[bool] = True
 
+# Lotes grandes vão no corpo do POST; via GET, 300 UUIDs passariam do limite de URL de muitos proxies
+MAX_IDS_POR_LOTE = 300
+MAX_IDS_POR_GET = 50
+
+class RadioIdsRequest(BaseModel):
+    ids: List[str]
+
+class RadioBatchResponse(BaseModel):
+    radios: List[RadioStation]
+    nao_encontradas: List[str]
+    inativas: List[str]
+
 # Customization Models
 class ThemeColors(BaseModel):
     primary: str = "#06B6D4"
@@ -165,6 +251,585 @@ async def verify_admin_token(credentials: HTTPAuthorizationCredentials = Depends
         raise HTTPException(status_code=401, detail="Token inválido")
     return credentials.credentials
 
+# Feed de alterações do catálogo (SSE)
+class RadioChangeFeed:
+    """Distribui eventos de alteração de rádios para os clientes conectados.
+
+    Quando o MongoDB roda como replica set, os eventos vêm de um change stream
+    e o id de cada evento é o resume token do Mongo. Caso contrário, as rotas de
+    escrita publicam diretamente aqui e o id é um contador local do processo.
+    """
+
+    def __init__(self, tamanho_buffer: int = 1000, tamanho_fila: int = 256):
+        self.buffer: deque = deque(maxlen=tamanho_buffer)
+        self.assinantes: set = set()
+        self.tamanho_fila = tamanho_fila
+        self.mongo_ativo = False
+        self.prefixo = uuid.uuid4().hex[:8]
+        self.sequencia = 0
+        self.ouvintes: List[Any] = []
+
+    def publicar(self, evento: Dict[str, Any], evento_id: Optional[str] = None):
+        if evento_id is None:
+            self.sequencia += 1
+            evento_id = f"{self.prefixo}-{self.sequencia}"
+        evento = {**evento, "id": evento_id}
+        self.buffer.append(evento)
+        for ouvinte in self.ouvintes:
+            try:
+                ouvinte(evento)
+            except Exception:
+                logger.exception(f"Falha ao aplicar o evento {evento_id}")
+        for fila in list(self.assinantes):
+            if fila.qsize() >= self.tamanho_fila:
+                # Cliente lento: encerra a conexão para que ele retome pelo último id recebido
+                self.assinantes.discard(fila)
+                fila.put_nowait(None)
+            else:
+                fila.put_nowait(evento)
+
+    def assinar(self) -> asyncio.Queue:
+        fila = asyncio.Queue()
+        self.assinantes.add(fila)
+        return fila
+
+    def cancelar(self, fila: asyncio.Queue):
+        self.assinantes.discard(fila)
+
+    def eventos_apos(self, evento_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Eventos posteriores a evento_id, ou None se o id não está mais no buffer"""
+        eventos = list(self.buffer)
+        for indice, evento in enumerate(eventos):
+            if evento["id"] == evento_id:
+                return eventos[indice + 1:]
+        return None
+
+radio_changes = RadioChangeFeed()
+
+# Mapeia o _id do Mongo para o id da rádio, já que eventos de delete só trazem o _id
+radio_ids_por_oid: Dict[str, str] = {}
+
+def notify_radio_change(tipo: str, radio_id: str, dados: Optional[Dict[str, Any]] = None):
+    """Publica uma alteração feita por este processo (somente sem change streams)"""
+    if radio_changes.mongo_ativo:
+        return
+    radio_changes.publicar({"tipo": tipo, "radio_id": radio_id, "dados": dados})
+
+def change_to_event(change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Converte um documento de change stream em evento do feed"""
+    try:
+        return _change_to_event(change)
+    except Exception:
+        # Um documento fora do modelo não pode derrubar o feed inteiro
+        logger.exception(f"Evento de change stream ignorado: {change.get('_id')}")
+        return None
+
+def _change_to_event(change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    operacao = change.get("operationType")
+    oid = str(change.get("documentKey", {}).get("_id"))
+    documento = change.get("fullDocument")
+
+    if operacao == "delete":
+        radio_id = radio_ids_por_oid.pop(oid, None)
+        return {"tipo": "delete", "radio_id": radio_id, "dados": None}
+
+    if operacao not in ("insert", "update", "replace") or not documento:
+        return None
+
+    radio_id = documento.get("id")
+    radio_ids_por_oid[oid] = radio_id
+    dados = jsonable_encoder(RadioStation(**documento))
+
+    if operacao == "insert":
+        return {"tipo": "create", "radio_id": radio_id, "dados": dados}
+
+    campos = set(change.get("updateDescription", {}).get("updatedFields", {}))
+    tipo = "logo" if campos == {"logo_url"} else "update"
+    return {"tipo": tipo, "radio_id": radio_id, "dados": dados}
+
+def open_radio_change_stream(resume_after: Optional[str] = None):
+    return db.radios.watch(
+        full_document="updateLookup",
+        resume_after={"_data": resume_after} if resume_after else None,
+    )
+
+# 40573: $changeStream só é suportado em replica sets; 40324: estágio desconhecido (Mongo antigo)
+CHANGE_STREAM_UNSUPPORTED_CODES = {40573, 40324}
+# 286: histórico do oplog perdido; 280: erro fatal do change stream (token inválido)
+CHANGE_STREAM_HISTORY_LOST_CODES = {286, 280}
+
+async def watch_radio_changes():
+    """Alimenta o feed a partir do change stream, se o Mongo for replica set"""
+    ultimo_token = None
+    try:
+        while True:
+            try:
+                if not radio_ids_por_oid:
+                    async for radio in db.radios.find({}, {"_id": 1, "id": 1}):
+                        radio_ids_por_oid[str(radio["_id"])] = radio.get("id")
+                async with open_radio_change_stream(ultimo_token) as stream:
+                    radio_changes.mongo_ativo = True
+                    logger.info("Feed de alterações usando change streams do MongoDB")
+                    async for change in stream:
+                        ultimo_token = change["_id"]["_data"]
+                        evento = change_to_event(change)
+                        if evento:
+                            radio_changes.publicar(evento, ultimo_token)
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAM_UNSUPPORTED_CODES:
+                    logger.info("MongoDB sem suporte a change streams; usando feed em memória")
+                    return
+                if e.code in CHANGE_STREAM_HISTORY_LOST_CODES:
+                    # Token expirou no oplog: recomeça do momento atual
+                    ultimo_token = None
+                logger.warning(f"Change stream interrompido ({e}); reiniciando")
+                await asyncio.sleep(1)
+            except PyMongoError as e:
+                logger.warning(f"Erro no change stream: {e}; reconectando")
+                await asyncio.sleep(1)
+            except Exception:
+                logger.exception("Erro inesperado no change stream; reiniciando")
+                await asyncio.sleep(1)
+    finally:
+        # Sem o watcher, as rotas de escrita voltam a publicar no feed em memória
+        radio_changes.mongo_ativo = False
+
+async def catch_up_from_mongo(evento_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Recupera eventos perdidos direto do oplog quando o id já saiu do buffer"""
+    eventos = []
+    try:
+        async with open_radio_change_stream(evento_id) as stream:
+            while True:
+                change = await stream.try_next()
+                if change is None:
+                    return eventos
+                evento = change_to_event(change)
+                if evento:
+                    eventos.append({**evento, "id": change["_id"]["_data"]})
+    except PyMongoError:
+        return None
+
+def format_sse(evento: Dict[str, Any]) -> str:
+    dados = json.dumps({k: v for k, v in evento.items() if k != "id"}, ensure_ascii=False)
+    return f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {dados}\n\n"
+
+# Cache em memória com expiração
+class TTLCache:
+    """Cache simples chave/valor com tempo de vida por entrada"""
+
+    def __init__(self, ttl: float, max_itens: int = 1000):
+        self.ttl = ttl
+        self.max_itens = max_itens
+        self.itens: Dict[Any, tuple] = {}
+
+    def get(self, chave: Any) -> Any:
+        item = self.itens.get(chave)
+        if item is None:
+            return None
+        valor, expira_em = item
+        if expira_em < time.monotonic():
+            self.itens.pop(chave, None)
+            return None
+        return valor
+
+    def set(self, chave: Any, valor: Any):
+        if len(self.itens) >= self.max_itens:
+            self.itens.clear()
+        self.itens[chave] = (valor, time.monotonic() + self.ttl)
+
+    def clear(self, *_):
+        self.itens.clear()
+
+# Limites de taxa e controle de admissão
+class RateLimiter:
+    """Token bucket por chave (IP do cliente ou token admin)"""
+
+    def __init__(self, taxa: float, capacidade: float, max_chaves: int = 10000):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.max_chaves = max_chaves
+        self.baldes: Dict[str, tuple] = {}
+        self.rejeitadas = 0
+
+    def consumir(self, chave: str) -> float:
+        """Consome um token; retorna 0 se permitido ou os segundos até o próximo token"""
+        agora = time.monotonic()
+        tokens, ultimo = self.baldes.get(chave, (self.capacidade, agora))
+        tokens = min(self.capacidade, tokens + (agora - ultimo) * self.taxa)
+        if tokens < 1:
+            self.baldes[chave] = (tokens, agora)
+            self.rejeitadas += 1
+            return (1 - tokens) / self.taxa
+        if len(self.baldes) >= self.max_chaves and chave not in self.baldes:
+            # Baldes cheios equivalem a baldes ausentes, então podem ser descartados.
+            # Se ainda sobrar mais da metade, descarta os mais antigos, para que a
+            # limpeza (O(n)) aconteça no máximo a cada max_chaves / 2 chaves novas.
+            restantes = [
+                (k, (t, u)) for k, (t, u) in self.baldes.items()
+                if t + (agora - u) * self.taxa < self.capacidade
+            ]
+            self.baldes = dict(restantes[-max(1, self.max_chaves // 2):])
+        self.baldes[chave] = (tokens - 1, agora)
+        return 0
+
+class AdmissionControl:
+    """Limite global de consultas simultâneas ao banco; excedentes falham na hora"""
+
+    def __init__(self, limite: int):
+        self.limite = limite
+        self.em_andamento = 0
+        self.rejeitadas = 0
+
+    def admitir(self):
+        if self.em_andamento >= self.limite:
+            self.rejeitadas += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Servidor sobrecarregado, tente novamente",
+                headers={"Retry-After": "1"}
+            )
+        self.em_andamento += 1
+
+    def liberar(self, *_):
+        self.em_andamento -= 1
+
+ip_rate_limiter = RateLimiter(
+    taxa=float(os.environ.get('RATE_LIMIT_IP_RPS', '20')),
+    capacidade=float(os.environ.get('RATE_LIMIT_IP_BURST', '40'))
+)
+admin_rate_limiter = RateLimiter(
+    taxa=float(os.environ.get('RATE_LIMIT_ADMIN_RPS', '10')),
+    capacidade=float(os.environ.get('RATE_LIMIT_ADMIN_BURST', '20'))
+)
+# Dimensionado para uma pessoa digitando na busca (o frontend aplica debounce)
+busca_rate_limiter = RateLimiter(
+    taxa=float(os.environ.get('RATE_LIMIT_BUSCA_RPS', '2')),
+    capacidade=float(os.environ.get('RATE_LIMIT_BUSCA_BURST', '10'))
+)
+db_admission = AdmissionControl(int(os.environ.get('DB_MAX_CONCURRENT_QUERIES', '50')))
+
+# Proxies confiáveis (IPs ou redes CIDR separados por vírgula). Sem eles, o
+# X-Forwarded-For é ignorado, pois o cliente pode preenchê-lo livremente.
+trusted_proxies = [
+    ipaddress.ip_network(rede.strip(), strict=False)
+    for rede in os.environ.get('TRUSTED_PROXIES', '').split(',')
+    if rede.strip()
+]
+# Atrás de um ingress sem TRUSTED_PROXIES, todos os usuários teriam o IP do proxy
+# e dividiriam um único balde. Por isso, no modo "auto" (padrão), os limites por IP
+# só valem com proxies configurados; "on" é para quando a API recebe os clientes
+# diretamente, e "off" desliga os limites por IP.
+rate_limit_by_ip = os.environ.get('RATE_LIMIT_BY_IP', 'auto').lower()
+limitar_por_ip = rate_limit_by_ip == 'on' or (rate_limit_by_ip == 'auto' and bool(trusted_proxies))
+
+def is_trusted_proxy(endereco: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(endereco)
+    except ValueError:
+        return False
+    return any(ip in rede for rede in trusted_proxies)
+
+def client_ip(request: Request) -> str:
+    """IP usado como chave dos limites de taxa"""
+    ip = request.client.host if request.client else "desconhecido"
+    if not is_trusted_proxy(ip):
+        return ip
+    # Percorre os saltos da direita para a esquerda até o primeiro não adicionado por um proxy confiável
+    for salto in reversed(request.headers.get("x-forwarded-for", "").split(",")):
+        salto = salto.strip()
+        if not salto:
+            continue
+        ip = salto
+        if not is_trusted_proxy(salto):
+            break
+    return ip
+
+# Coalescência de leituras idênticas concorrentes
+class SingleFlight:
+    """Faz chamadas concorrentes com a mesma chave aguardarem uma única consulta.
+
+    A consulta roda em uma task própria, então o cancelamento de um cliente
+    não afeta os demais que estão aguardando o mesmo resultado.
+    """
+
+    def __init__(self):
+        self.em_andamento: Dict[tuple, asyncio.Future] = {}
+        self.chamadas: Dict[str, int] = {}
+        self.coalescidas: Dict[str, int] = {}
+
+    async def executar(self, grupo: str, chave: tuple, funcao):
+        chave = (grupo, *chave)
+        self.chamadas[grupo] = self.chamadas.get(grupo, 0) + 1
+        tarefa = self.em_andamento.get(chave)
+        if tarefa is None:
+            db_admission.admitir()
+            tarefa = asyncio.ensure_future(funcao())
+            self.em_andamento[chave] = tarefa
+            tarefa.add_done_callback(db_admission.liberar)
+            tarefa.add_done_callback(lambda t: self._finalizar(chave, t))
+        else:
+            self.coalescidas[grupo] = self.coalescidas.get(grupo, 0) + 1
+        return await asyncio.shield(tarefa)
+
+    def _finalizar(self, chave: tuple, tarefa: asyncio.Future):
+        self.em_andamento.pop(chave, None)
+        if not tarefa.cancelled():
+            # Evita o aviso de exceção não recuperada quando todos os clientes desistiram
+            tarefa.exception()
+
+    def metricas(self) -> Dict[str, Dict[str, int]]:
+        return {
+            grupo: {"chamadas": total, "coalescidas": self.coalescidas.get(grupo, 0)}
+            for grupo, total in self.chamadas.items()
+        }
+
+single_flight = SingleFlight()
+
+# Totais de listagens paginadas por formato de filtro; zerados a cada alteração no catálogo
+radio_count_cache = TTLCache(ttl=30)
+radio_changes.ouvintes.append(radio_count_cache.clear)
+
+stats_cache = TTLCache(ttl=30)
+radio_changes.ouvintes.append(stats_cache.clear)
+
+customization_cache = TTLCache(ttl=60)
+
+async def count_radios(filtros: Dict[str, Any], chave: tuple) -> int:
+    # Sem filtros além de ativo=True, o total já está nas estatísticas em cache
+    if filtros == {"ativo": True}:
+        return (await get_stats())["total_radios"]
+    total = radio_count_cache.get(chave)
+    if total is None:
+        total = await single_flight.executar(
+            "total", chave, lambda: catalog_db.radios.count_documents(filtros)
+        )
+        radio_count_cache.set(chave, total)
+    return total
+
+# Índice de sugestões (typeahead)
+def normalize_text(texto: str) -> str:
+    """Remove acentos e normaliza caixa para comparação de prefixos"""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold().strip()
+
+class SuggestionIndex:
+    """Array ordenado de chaves sem acento para nome, cidade e estado.
+
+    Cada valor é indexado pelo texto completo e por cada sufixo de palavra,
+    então "paulo" encontra "São Paulo". A popularidade de uma rádio é o número
+    de acessos ao seu detalhe; a de cidades e estados é o número de rádios ativas.
+
+    Prefixos com poucas entradas são ranqueados na hora. Os que cobrem muitas
+    entradas ("r", "radio", "fm") usam um top-K pré-calculado, montado de baixo
+    para cima a partir dos prefixos filhos; ele é descartado quando uma entrada
+    sob o prefixo muda e refeito a cada recarga, que atualiza a popularidade.
+    """
+
+    TOP_K = 20
+
+    def __init__(self, limiar_precalculo: int = 256, recarregar_apos: float = 300):
+        # Entradas (chave, tipo, valor, radio_id, inicio) e suas chaves, em listas paralelas
+        self.entradas: List[tuple] = []
+        self.chaves: List[str] = []
+        self.radios: Dict[str, Dict[str, str]] = {}
+        self.contagem: Dict[tuple, int] = {}
+        self.acessos: Dict[str, int] = {}
+        self.limiar_precalculo = limiar_precalculo
+        self.top_prefixos: Dict[str, List[tuple]] = {}
+        self.carregado = False
+        self.carregado_em = 0.0
+        # Sem change streams, alterações feitas por outros workers só chegam na recarga
+        self.recarregar_apos = recarregar_apos
+        self.recarga: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    @staticmethod
+    def _entradas_de(tipo: str, valor: str, radio_id: str) -> List[tuple]:
+        palavras = normalize_text(valor).split()
+        return [
+            (" ".join(palavras[i:]), tipo, valor, radio_id, i == 0)
+            for i in range(len(palavras))
+        ]
+
+    def _invalidar(self, chave: str):
+        for tamanho in range(1, len(chave) + 1):
+            self.top_prefixos.pop(chave[:tamanho], None)
+
+    def _inserir_chaves(self, tipo: str, valor: str, radio_id: str = ""):
+        for entrada in self._entradas_de(tipo, valor, radio_id):
+            indice = bisect.bisect_left(self.entradas, entrada)
+            self.entradas.insert(indice, entrada)
+            self.chaves.insert(indice, entrada[0])
+            self._invalidar(entrada[0])
+
+    def _remover_chaves(self, tipo: str, valor: str, radio_id: str = ""):
+        for entrada in self._entradas_de(tipo, valor, radio_id):
+            indice = bisect.bisect_left(self.entradas, entrada)
+            if indice < len(self.entradas) and self.entradas[indice] == entrada:
+                del self.entradas[indice]
+                del self.chaves[indice]
+                self._invalidar(entrada[0])
+
+    def _contar(self, tipo: str, valor: str, delta: int):
+        total = self.contagem.get((tipo, valor), 0) + delta
+        if total <= 0:
+            self.contagem.pop((tipo, valor), None)
+            self._remover_chaves(tipo, valor)
+        else:
+            if total == delta:
+                self._inserir_chaves(tipo, valor)
+            self.contagem[(tipo, valor)] = total
+
+    def adicionar(self, radio: Dict[str, Any]):
+        self.remover(radio["id"])
+        if not radio.get("ativo", True):
+            return
+        self.radios[radio["id"]] = {campo: radio[campo] for campo in ("nome", "cidade", "estado")}
+        self._inserir_chaves("radio", radio["nome"], radio["id"])
+        self._contar("cidade", radio["cidade"], 1)
+        self._contar("estado", radio["estado"], 1)
+
+    def remover(self, radio_id: str):
+        radio = self.radios.pop(radio_id, None)
+        if radio is None:
+            return
+        self._remover_chaves("radio", radio["nome"], radio_id)
+        self._contar("cidade", radio["cidade"], -1)
+        self._contar("estado", radio["estado"], -1)
+
+    def registrar_acesso(self, radio_id: str):
+        self.acessos[radio_id] = self.acessos.get(radio_id, 0) + 1
+
+    def aplicar_evento(self, evento: Dict[str, Any]):
+        if not self.carregado or not evento.get("radio_id"):
+            return
+        if evento["tipo"] == "delete":
+            self.remover(evento["radio_id"])
+        elif evento.get("dados"):
+            self.adicionar(evento["dados"])
+
+    def reconstruir(self, radios: List[Dict[str, Any]]):
+        """Monta o índice inteiro de uma vez (ordenação única) e pré-calcula os prefixos grandes"""
+        self.radios, self.contagem = {}, {}
+        entradas = []
+        for radio in radios:
+            if not radio.get("ativo", True):
+                continue
+            self.radios[radio["id"]] = {campo: radio[campo] for campo in ("nome", "cidade", "estado")}
+            entradas += self._entradas_de("radio", radio["nome"], radio["id"])
+            for tipo in ("cidade", "estado"):
+                chave = (tipo, radio[tipo])
+                if chave not in self.contagem:
+                    entradas += self._entradas_de(tipo, radio[tipo], "")
+                self.contagem[chave] = self.contagem.get(chave, 0) + 1
+        entradas.sort()
+        self.entradas = entradas
+        self.chaves = [entrada[0] for entrada in entradas]
+        self.top_prefixos = {}
+        self._precalcular("", 0, len(self.chaves))
+
+    async def carregar(self, forcar: bool = False):
+        async with self.lock:
+            if self.carregado and not forcar:
+                return
+            projecao = {"_id": 0, "id": 1, "nome": 1, "cidade": 1, "estado": 1, "ativo": 1}
+            radios = await catalog_db.radios.find({"ativo": True}, projecao).to_list(length=None)
+            # Reconstrói sem pontos de espera, para que nenhuma consulta veja o índice pela metade
+            self.reconstruir(radios)
+            self.carregado = True
+            self.carregado_em = time.monotonic()
+
+    def agendar_recarga(self):
+        """Recarrega em segundo plano quando o índice passou da validade"""
+        expirado = time.monotonic() - self.carregado_em > self.recarregar_apos
+        if self.carregado and expirado and (self.recarga is None or self.recarga.done()):
+            self.recarga = asyncio.create_task(self._recarregar())
+
+    async def _recarregar(self):
+        try:
+            await self.carregar(forcar=True)
+        except Exception:
+            logger.exception("Falha ao recarregar o índice de sugestões")
+
+    def _peso(self, tipo: str, valor: str, radio_id: str, inicio: bool) -> int:
+        if tipo == "radio":
+            popularidade = self.acessos.get(radio_id, 0)
+        else:
+            popularidade = self.contagem.get((tipo, valor), 0)
+        # Correspondência no início do valor pesa o dobro da de uma palavra interna
+        return (popularidade + 1) * (2 if inicio else 1)
+
+    def _melhores(self, candidatos: Dict[tuple, int], limite: int) -> List[tuple]:
+        return heapq.nsmallest(
+            limite, candidatos.items(), key=lambda c: (-c[1], len(c[0][1]), c[0][1])
+        )
+
+    def _ranquear_faixa(self, inicio_faixa: int, fim_faixa: int, candidatos: Dict[tuple, int]):
+        for _, tipo, valor, radio_id, inicio in self.entradas[inicio_faixa:fim_faixa]:
+            peso = self._peso(tipo, valor, radio_id, inicio)
+            item = (tipo, valor, radio_id)
+            if peso > candidatos.get(item, 0):
+                candidatos[item] = peso
+
+    def _precalcular(self, prefixo: str, inicio_faixa: int, fim_faixa: int) -> List[tuple]:
+        """Top-K de um prefixo grande, combinando o top-K (ou a faixa) de cada filho.
+
+        O melhor peso de um item no prefixo é o melhor entre os filhos, então o
+        top-K do prefixo está sempre contido na união dos top-K dos filhos.
+        """
+        candidatos: Dict[tuple, int] = {}
+        indice = inicio_faixa
+        while indice < fim_faixa:
+            chave = self.chaves[indice]
+            if len(chave) == len(prefixo):
+                self._ranquear_faixa(indice, indice + 1, candidatos)
+                indice += 1
+                continue
+            filho = chave[:len(prefixo) + 1]
+            fim_filho = bisect.bisect_right(self.chaves, filho + "\U0010ffff", indice, fim_faixa)
+            if fim_filho - indice > self.limiar_precalculo:
+                top_filho = self.top_prefixos.get(filho)
+                if top_filho is None:
+                    top_filho = self._precalcular(filho, indice, fim_filho)
+                for item, peso in top_filho:
+                    if peso > candidatos.get(item, 0):
+                        candidatos[item] = peso
+            else:
+                self._ranquear_faixa(indice, fim_filho, candidatos)
+            indice = fim_filho
+
+        melhores = self._melhores(candidatos, self.TOP_K)
+        if prefixo:
+            self.top_prefixos[prefixo] = melhores
+        return melhores
+
+    def sugerir(self, termo: str, limite: int) -> List[Dict[str, Any]]:
+        prefixo = normalize_text(termo)
+        if not prefixo:
+            return []
+
+        melhores = self.top_prefixos.get(prefixo)
+        if melhores is None:
+            inicio_faixa = bisect.bisect_left(self.chaves, prefixo)
+            fim_faixa = bisect.bisect_right(self.chaves, prefixo + "\U0010ffff")
+            if fim_faixa - inicio_faixa > self.limiar_precalculo:
+                # Prefixo grande invalidado por uma alteração: refaz o top-K uma vez
+                melhores = self._precalcular(prefixo, inicio_faixa, fim_faixa)
+            else:
+                candidatos: Dict[tuple, int] = {}
+                self._ranquear_faixa(inicio_faixa, fim_faixa, candidatos)
+                melhores = self._melhores(candidatos, limite)
+
+        return [
+            {"tipo": tipo, "valor": valor, "radio_id": radio_id or None}
+            for (tipo, valor, radio_id), _ in melhores[:limite]
+        ]
+
+suggestion_index = SuggestionIndex(
+    recarregar_apos=float(os.environ.get('SUGGESTION_RELOAD_S', '300'))
+)
+radio_changes.ouvintes.append(suggestion_index.aplicar_evento)
+
 # Radio Routes
 @api_router.get("/")
 async def root():
@@ -172,6 +837,7 @@ async def root():
 
 @api_router.get("/radios", response_model=List[RadioStation])
 async def get_radios(
+    response: Response,
     busca: Optional[str] = Query(None, description="Buscar por nome, cidade ou estado"),
     genero: Optional[GeneroEnum] = Query(None, description="Filtrar por gênero"),
     regiao: Optional[RegiaoEnum] = Query(None, description="Filtrar por região"),
@@ -179,7 +845,8 @@ async def get_radios(
     estado: Optional[str] = Query(None, description="Filtrar por estado"),
     ativo: Optional[bool] = Query(True, description="Filtrar por status ativo"),
     limite: int = Query(50, ge=1, le=100, description="Limite de resultados"),
-    pagina: int = Query(1, ge=1, description="Página")
+    pagina: int = Query(1, ge=1, description="Página"),
+    incluir_total: bool = Query(False, description="Retornar o total no header X-Total-Count")
 ):
     """Buscar rádios com filtros"""
     
@@ -214,16 +881,114 @@ async def get_radios(
     skip = (pagina - 1) * limite
     
     # Buscar no banco
-    radios = await db.radios.find(filtros).skip(skip).limit(limite).to_list(length=limite)
+    radios = await single_flight.executar(
+        "radios",
+        (busca, genero, regiao, cidade, estado, ativo, limite, pagina),
+        lambda: catalog_db.radios.find(filtros).skip(skip).limit(limite).to_list(length=limite)
+    )
+    
+    # Total (a chave usa os textos exatos, pois eles são interpretados como regex)
+    if incluir_total:
+        chave = (ativo, genero, regiao, cidade, estado, busca)
+        total = await count_radios(filtros, chave)
+        response.headers["X-Total-Count"] = str(total)
     
     return [RadioStation(**radio) for radio in radios]
 
+async def find_radios_by_ids(ids: List[str], maximo: int = MAX_IDS_POR_LOTE) -> RadioBatchResponse:
+    ids = list(dict.fromkeys(radio_id.strip() for radio_id in ids if radio_id.strip()))
+    if len(ids) > maximo:
+        detalhe = f"Máximo de {maximo} ids por requisição"
+        if maximo < MAX_IDS_POR_LOTE:
+            detalhe += f"; use POST /api/radios/por-ids para até {MAX_IDS_POR_LOTE}"
+        raise HTTPException(status_code=400, detail=detalhe)
+    documentos = await single_flight.executar(
+        "por_ids",
+        tuple(ids),
+        lambda: catalog_db.radios.find({"id": {"$in": ids}}).to_list(length=len(ids))
+    )
+    por_id = {radio["id"]: radio for radio in documentos}
+
+    radios, nao_encontradas, inativas = [], [], []
+    for radio_id in ids:
+        radio = por_id.get(radio_id)
+        if radio is None:
+            nao_encontradas.append(radio_id)
+        elif not radio.get("ativo", True):
+            inativas.append(radio_id)
+        else:
+            radios.append(RadioStation(**radio))
+    return RadioBatchResponse(radios=radios, nao_encontradas=nao_encontradas, inativas=inativas)
+
+@api_router.get("/radios/por-ids", response_model=RadioBatchResponse)
+async def get_radios_por_ids(
+    ids: str = Query(..., description="Até 50 ids separados por vírgula, na ordem desejada")
+):
+    """Buscar até 50 rádios por ID (favoritos, recentes); lotes maiores via POST"""
+    return await find_radios_by_ids(ids.split(","), maximo=MAX_IDS_POR_GET)
+
+@api_router.post("/radios/por-ids", response_model=RadioBatchResponse)
+async def post_radios_por_ids(dados: RadioIdsRequest):
+    """Buscar até 300 rádios por ID, com os ids no corpo da requisição"""
+    return await find_radios_by_ids(dados.ids)
+
+@api_router.get("/radios/alteracoes")
+async def stream_radio_changes(
+    request: Request,
+    desde: Optional[str] = Query(None, description="Id do último evento recebido"),
+    last_event_id: Optional[str] = Header(None)
+):
+    """Feed de alterações de rádios via server-sent events"""
+    ultimo_id = last_event_id or desde
+    fila = radio_changes.assinar()
+
+    pendentes: Optional[List[Dict[str, Any]]] = []
+    if ultimo_id:
+        pendentes = radio_changes.eventos_apos(ultimo_id)
+        if pendentes is None and radio_changes.mongo_ativo:
+            pendentes = await catch_up_from_mongo(ultimo_id)
+
+    async def eventos():
+        enviados = set()
+        try:
+            yield "retry: 3000\n\n"
+            if pendentes is None:
+                # Não é possível retomar: o cliente deve recarregar o catálogo
+                yield "event: reset\ndata: {}\n\n"
+            else:
+                for evento in pendentes:
+                    enviados.add(evento["id"])
+                    yield format_sse(evento)
+
+            while not await request.is_disconnected():
+                try:
+                    evento = await asyncio.wait_for(fila.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if evento is None:
+                    break
+                if evento["id"] in enviados:
+                    continue
+                yield format_sse(evento)
+        finally:
+            radio_changes.cancelar(fila)
+
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @api_router.get("/radios/{radio_id}", response_model=RadioStation)
 async def get_radio(radio_id: str):
     """Buscar rádio por ID"""
-    radio = await db.radios.find_one({"id": radio_id})
+    radio = await single_flight.executar(
+        "radio", (radio_id,), lambda: catalog_db.radios.find_one({"id": radio_id})
+    )
     if not radio:
         raise HTTPException(status_code=404, detail="Rádio não encontrada")
+    suggestion_index.registrar_acesso(radio_id)
     return RadioStation(**radio)
 
 @api_router.post("/radios", response_model=RadioStation)
@@ -237,6 +1002,7 @@ async def create_radio(radio_data: RadioStationCreate, _: str = Depends(verify_a
         raise HTTPException(status_code=400, detail="Já existe uma rádio com este nome")
     
     await db.radios.insert_one(radio.dict())
+    notify_radio_change("create", radio.id, jsonable_encoder(radio))
     return radio
 
 @api_router.put("/radios/{radio_id}", response_model=RadioStation)
@@ -256,7 +1022,10 @@ async def update_radio(radio_id: str, radio_data: RadioStationUpdate, _: str = D
     
     # Retornar atualizado
     updated_radio = await db.radios.find_one({"id": radio_id})
-    return RadioStation(**updated_radio)
+    radio = RadioStation(**updated_radio)
+    if update_data:
+        notify_radio_change("update", radio_id, jsonable_encoder(radio))
+    return radio
 
 @api_router.delete("/radios/{radio_id}")
 async def delete_radio(radio_id: str, _: str = Depends(verify_admin_token)):
@@ -266,6 +1035,7 @@ async def delete_radio(radio_id: str, _: str = Depends(verify_admin_token)):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Rádio não encontrada")
     
+    notify_radio_change("delete", radio_id)
     return {"message": "Rádio deletada com sucesso"}
 
 @api_router.post("/upload/logo/{radio_id}")
@@ -297,6 +1067,7 @@ async def upload_logo(radio_id: str, file: UploadFile = File(...), _: str = Depe
         {"id": radio_id}, 
         {"$set": {"logo_url": logo_url}}
     )
+    notify_radio_change("logo", radio_id, jsonable_encoder(RadioStation(**{**radio, "logo_url": logo_url})))
     
     return {"message": "Logo atualizado com sucesso", "logo_url": logo_url}
 
@@ -304,13 +1075,19 @@ async def upload_logo(radio_id: str, file: UploadFile = File(...), _: str = Depe
 @api_router.get("/customization", response_model=PlatformCustomization)
 async def get_customization():
     """Buscar configurações de customização ativas"""
+    cached = customization_cache.get("ativa")
+    if cached:
+        return cached
     customization = await db.customization.find_one({"active": True})
     if not customization:
         # Criar configuração padrão se não existir
         default_config = PlatformCustomization()
         await db.customization.insert_one(default_config.dict())
+        customization_cache.set("ativa", default_config)
         return default_config
-    return PlatformCustomization(**customization)
+    customization = PlatformCustomization(**customization)
+    customization_cache.set("ativa", customization)
+    return customization
 
 @api_router.put("/customization", response_model=PlatformCustomization)
 async def update_customization(
@@ -337,6 +1114,8 @@ async def update_customization(
             {"$set": update_data}
         )
     
+    customization_cache.clear()
+    
     # Retornar configuração atualizada
     updated_config = await db.customization.find_one({"active": True})
     return PlatformCustomization(**updated_config)
@@ -368,6 +1147,7 @@ async def upload_platform_logo(
         {"active": True}, 
         {"$set": {"logo_url": logo_url, "updated_at": datetime.utcnow()}}
     )
+    customization_cache.clear()
     
     return {"message": "Logo da plataforma atualizado com sucesso", "logo_url": logo_url}
 
@@ -381,46 +1161,59 @@ async def reset_customization(_: str = Depends(verify_admin_token)):
     # Criar nova configuração padrão
     default_config = PlatformCustomization()
     await db.customization.insert_one(default_config.dict())
+    customization_cache.clear()
     
     return {"message": "Configurações resetadas para padrão", "customization": default_config}
 
 # Other Routes
+@api_router.get("/sugestoes")
+async def get_sugestoes(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefixo digitado"),
+    limite: int = Query(8, ge=1, le=20, description="Máximo de sugestões")
+):
+    """Sugestões de nomes de rádios, cidades e estados para a busca"""
+    if not suggestion_index.carregado:
+        await suggestion_index.carregar()
+    suggestion_index.agendar_recarga()
+    return suggestion_index.sugerir(q, limite)
+
+GENEROS = [{"value": genero.value, "label": genero.value} for genero in GeneroEnum]
+REGIOES = [{"value": regiao.value, "label": regiao.value} for regiao in RegiaoEnum]
+
 @api_router.get("/generos")
 async def get_generos():
     """Listar todos os gêneros disponíveis"""
-    return [{"value": genero.value, "label": genero.value} for genero in GeneroEnum]
+    return GENEROS
 
 @api_router.get("/regioes")
 async def get_regioes():
     """Listar todas as regiões disponíveis"""
-    return [{"value": regiao.value, "label": regiao.value} for regiao in RegiaoEnum]
+    return REGIOES
 
 @api_router.get("/cidades")
 async def get_cidades():
     """Listar todas as cidades cadastradas"""
-    cidades = await db.radios.distinct("cidade")
+    cidades = await single_flight.executar("cidades", (), lambda: catalog_db.radios.distinct("cidade"))
     return sorted(cidades)
 
 @api_router.get("/estados")
 async def get_estados():
     """Listar todos os estados cadastrados"""
-    estados = await db.radios.distinct("estado")
+    estados = await single_flight.executar("estados", (), lambda: catalog_db.radios.distinct("estado"))
     return sorted(estados)
 
-@api_router.get("/stats")
-async def get_stats():
-    """Estatísticas da plataforma"""
-    total_radios = await db.radios.count_documents({"ativo": True})
+async def compute_stats():
+    total_radios = await catalog_db.radios.count_documents({"ativo": True})
     
     # Contagem por gênero
-    generos = await db.radios.aggregate([
+    generos = await catalog_db.radios.aggregate([
         {"$match": {"ativo": True}},
         {"$group": {"_id": "$genero", "count": {"$sum": 1}}},
         {"$sort": {"count": -1}}
     ]).to_list(length=None)
     
     # Contagem por região
-    regioes = await db.radios.aggregate([
+    regioes = await catalog_db.radios.aggregate([
         {"$match": {"ativo": True}},
         {"$group": {"_id": "$regiao", "count": {"$sum": 1}}},
         {"$sort": {"count": -1}}
@@ -432,6 +1225,59 @@ async def get_stats():
         "por_regiao": regioes
     }
 
+@api_router.get("/stats")
+async def get_stats():
+    """Estatísticas da plataforma"""
+    stats = stats_cache.get("stats")
+    if stats is None:
+        stats = await single_flight.executar("stats", (), compute_stats)
+        stats_cache.set("stats", stats)
+    return stats
+
+@api_router.get("/metricas")
+async def get_metricas(_: str = Depends(verify_admin_token)):
+    """Métricas internas do processo (requer autenticação admin)"""
+    return {
+        "single_flight": single_flight.metricas(),
+        "admissao": {
+            "consultas_em_andamento": db_admission.em_andamento,
+            "limite": db_admission.limite,
+            "rejeitadas": db_admission.rejeitadas
+        },
+        "limites_por_ip_ativos": limitar_por_ip,
+        "limites_de_taxa_rejeitadas": {
+            "ip": ip_rate_limiter.rejeitadas,
+            "admin": admin_rate_limiter.rejeitadas,
+            "busca": busca_rate_limiter.rejeitadas
+        }
+    }
+
+@app.middleware("http")
+async def rate_limit(request: Request, call_next):
+    """Aplica os limites por cliente nas rotas da API"""
+    if not request.url.path.startswith("/api"):
+        return await call_next(request)
+
+    # Tokens inválidos caem no limite por IP, para não servirem de chave descartável
+    token = request.headers.get("authorization", "")[7:]
+    espera = 0
+    if token == ADMIN_TOKEN:
+        espera = admin_rate_limiter.consumir(token)
+    elif limitar_por_ip:
+        espera = ip_rate_limiter.consumir(client_ip(request))
+
+    busca = request.url.path == "/api/radios" and request.query_params.get("busca")
+    if not espera and busca and limitar_por_ip:
+        espera = busca_rate_limiter.consumir(client_ip(request))
+
+    if espera:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Muitas requisições, tente novamente em instantes"},
+            headers={"Retry-After": str(math.ceil(espera))}
+        )
+    return await call_next(request)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -442,6 +1288,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "Retry-After"],
 )
 
 # Configure logging
@@ -451,11 +1298,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+# 85/86: já existe um índice em "id" com outras opções ou outro nome; ele atende à consulta
+INDEX_CONFLICT_CODES = {85, 86}
+
+async def ensure_indexes():
+    try:
+        await db.radios.create_index("id")
+    except OperationFailure as e:
+        if e.code not in INDEX_CONFLICT_CODES:
+            raise
+        logger.warning(f"Índice em radios.id já existe com outras opções: {e}")
+
+def describe_error(erro: Exception) -> str:
+    return f"{type(erro).__name__}: {erro}"
+
+async def warm_up(app: FastAPI):
+    """Abre o pool de conexões e preenche os caches.
+
+    A prontidão depende só da conexão com o banco: o worker fica pronto após a
+    primeira rodada de aquecimento, mesmo que algum cache ou índice falhe. Essas
+    falhas ficam registradas em erros_aquecimento e são refeitas com backoff.
+    """
+    espera = 1
+    while True:
+        try:
+            await asyncio.gather(*(client.admin.command("ping") for _ in range(mongo_options["minPoolSize"])))
+            app.state.erros_aquecimento.pop("conexao", None)
+            break
+        except Exception as e:
+            app.state.erros_aquecimento["conexao"] = describe_error(e)
+            logger.warning(f"Falha ao conectar ao MongoDB: {e}; tentando novamente em {espera}s")
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, 30)
+
+    pendentes = {
+        "indices": ensure_indexes,
+        "customizacao": get_customization,
+        "stats": get_stats,
+        "sugestoes": suggestion_index.carregar,
+    }
+    espera = 2
+    while True:
+        for nome, passo in list(pendentes.items()):
+            try:
+                await passo()
+                pendentes.pop(nome)
+                app.state.erros_aquecimento.pop(nome, None)
+            except ConnectionFailure as e:
+                app.state.erros_aquecimento[nome] = describe_error(e)
+                logger.warning(f"Falha transitória no aquecimento de {nome}: {e}")
+            except Exception as e:
+                app.state.erros_aquecimento[nome] = describe_error(e)
+                logger.exception(f"Falha no aquecimento de {nome}; a rota correspondente pode falhar")
+
+        if not app.state.pronto:
+            app.state.pronto = True
+            logger.info("Aquecimento concluído" if not pendentes else f"Pronto com aquecimento pendente: {', '.join(pendentes)}")
+        if not pendentes:
+            return
+        await asyncio.sleep(espera)
+        espera = min(espera * 2, 300)
 
 # Health check
+@app.get("/health/live")
+async def liveness_check():
+    return {"status": "alive", "timestamp": datetime.utcnow()}
+
 @app.get("/health")
-async def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow()}
\ No newline at end of file
+@app.get("/health/ready")
+async def readiness_check():
+    inicio = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), timeout=2)
+        db_ok = True
+    except (PyMongoError, asyncio.TimeoutError):
+        db_ok = False
+    latencia_ms = round((time.perf_counter() - inicio) * 1000, 2)
+
+    pronto = db_ok and app.state.pronto
+    return JSONResponse(
+        status_code=200 if pronto else 503,
+        content=jsonable_encoder({
+            "status": "ready" if pronto else "not_ready",
+            "database": {"ok": db_ok, "ping_ms": latencia_ms},
+            "caches_aquecidos": app.state.pronto and not app.state.erros_aquecimento,
+            "erros_aquecimento": app.state.erros_aquecimento,
+            "timestamp": datetime.utcnow()
+        })
+    )
\ No newline at end of file
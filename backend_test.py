@@ -93,6 +93,18 @@ class RadioAPITester:
         """Test filtering radios by region"""
         return self.run_test("Filter Radios by Region", "GET", "radios?regiao=Sudeste", 200)
 
+    def test_get_radios_with_total(self):
+        """Test that incluir_total adds the X-Total-Count header"""
+        self.tests_run += 1
+        print("\n🔍 Testing Get Radios with Total...")
+        response = requests.get(f"{self.base_url}/radios?incluir_total=true&limite=1")
+        if response.status_code == 200 and response.headers.get("X-Total-Count", "").isdigit():
+            self.tests_passed += 1
+            print(f"✅ Passed - X-Total-Count: {response.headers['X-Total-Count']}")
+            return True, response.json()
+        print(f"❌ Failed - Status: {response.status_code}, headers: {dict(response.headers)}")
+        return False, {}
+
     def test_get_radio_by_id(self):
         """Test getting a radio by ID"""
         # First get all radios to find an ID
@@ -102,6 +114,18 @@ class RadioAPITester:
             return self.run_test(f"Get Radio by ID ({radio_id})", "GET", f"radios/{radio_id}", 200, print_response=True)
         return False, {}
 
+    def test_get_radios_by_ids(self):
+        """Test batch lookup keeps the requested order and reports missing ids"""
+        success, radios = self.run_test("Get All Radios for Batch", "GET", "radios?limite=3", 200)
+        if not success or not radios:
+            return False, {}
+        ids = [radio['id'] for radio in reversed(radios)] + ["id-inexistente"]
+        success, response = self.run_test("Get Radios by IDs", "POST", "radios/por-ids", 200, data={"ids": ids})
+        if success and ([r['id'] for r in response['radios']] != ids[:-1] or response['nao_encontradas'] != ["id-inexistente"]):
+            print(f"❌ Unexpected batch result: {response}")
+            return False, response
+        return success, response
+
     def test_get_genres(self):
         """Test getting all genres"""
         return self.run_test("Get All Genres", "GET", "generos", 200, print_response=True)
@@ -114,6 +138,10 @@ class RadioAPITester:
         """Test getting platform stats"""
         return self.run_test("Get Platform Stats", "GET", "stats", 200, print_response=True)
 
+    def test_get_suggestions(self):
+        """Test typeahead suggestions (accent-insensitive prefix)"""
+        return self.run_test("Get Suggestions (sao)", "GET", "sugestoes?q=sao", 200, print_response=True)
+
     def test_create_radio(self):
         """Test creating a new radio (admin only)"""
         test_radio = {
@@ -296,10 +324,13 @@ class RadioAPITester:
         self.test_search_radios()
         self.test_filter_radios_by_genre()
         self.test_filter_radios_by_region()
+        self.test_get_radios_with_total()
         self.test_get_radio_by_id()
+        self.test_get_radios_by_ids()
         self.test_get_genres()
         self.test_get_regions()
         self.test_get_stats()
+        self.test_get_suggestions()
         
         # Customization endpoints
         self.test_get_customization()
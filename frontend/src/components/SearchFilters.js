@@ -1,13 +1,35 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useMemo } from 'react';
+import { debounce } from '../utils/performance';
+
+const SEARCH_DEBOUNCE_MS = 400;
 
 const SearchFilters = ({ filters, generos, regioes, onFilterChange }) => {
   const [showAdvanced, setShowAdvanced] = useState(false);
+  const [busca, setBusca] = useState(filters.busca);
+
+  // Keep the input in sync when the search is cleared from outside
+  useEffect(() => {
+    setBusca(filters.busca);
+  }, [filters.busca]);
+
+  // Only search once the user pauses typing, instead of on every keystroke
+  const debouncedSearch = useMemo(
+    () => debounce((value) => onFilterChange({ busca: value }), SEARCH_DEBOUNCE_MS),
+    [onFilterChange]
+  );
 
   const handleInputChange = (field, value) => {
     onFilterChange({ [field]: value });
   };
 
+  const handleSearchChange = (value) => {
+    setBusca(value);
+    debouncedSearch(value);
+  };
+
   const clearAllFilters = () => {
+    // Also replaces any pending debounced search, so the old text does not come back
+    handleSearchChange('');
     onFilterChange({
       busca: '',
       genero: '',
@@ -31,8 +53,8 @@ const SearchFilters = ({ filters, generos, regioes, onFilterChange }) => {
         <input
           type="text"
           placeholder="Buscar por nome, cidade ou estado..."
-          value={filters.busca}
-          onChange={(e) => handleInputChange('busca', e.target.value)}
+          value={busca}
+          onChange={(e) => handleSearchChange(e.target.value)}
           className="w-full pl-10 pr-4 py-3 border border-gray-300 rounded-lg focus:ring-2 focus:ring-cyan-500 focus:border-transparent"
         />
       </div>
@@ -140,7 +162,10 @@ const SearchFilters = ({ filters, generos, regioes, onFilterChange }) => {
             <span className="inline-flex items-center px-3 py-1 rounded-full text-sm bg-cyan-100 text-cyan-800">
               Busca: "{filters.busca}"
               <button
-                onClick={() => handleInputChange('busca', '')}
+                onClick={() => {
+                  handleSearchChange('');
+                  handleInputChange('busca', '');
+                }}
                 className="ml-2 hover:text-cyan-600"
               >
                 <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
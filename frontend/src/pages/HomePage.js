@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { Link } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import { radioAPI } from '../services/api';
@@ -25,6 +25,8 @@ const HomePage = () => {
   const [stats, setStats] = useState(null);
   
   const { getRecentFavorites, favoritesCount } = useFavorites();
+  const latestRequest = useRef(0);
+  const retryTimer = useRef(null);
 
   useEffect(() => {
     loadInitialData();
@@ -52,25 +54,45 @@ const HomePage = () => {
   };
 
   const loadRadios = async () => {
+    // Ignore responses for filters that were already replaced (e.g. an older search prefix)
+    const requestId = ++latestRequest.current;
+    clearTimeout(retryTimer.current);
     try {
       setLoading(true);
       const data = await radioAPI.getRadios(filters);
+      if (requestId !== latestRequest.current) return;
       setRadios(data);
     } catch (error) {
+      if (requestId !== latestRequest.current) return;
+      if (error.response?.status === 429 || error.response?.status === 503) {
+        // Server asked us to slow down: keep the current results and retry once it allows
+        const retryAfter = parseInt(error.response.headers['retry-after'], 10) || 1;
+        retryTimer.current = setTimeout(loadRadios, retryAfter * 1000);
+        return;
+      }
       console.error('Erro ao carregar rádios:', error);
       toast.error('Erro ao carregar rádios');
     } finally {
-      setLoading(false);
+      if (requestId === latestRequest.current) {
+        setLoading(false);
+      }
     }
   };
 
-  const handleFilterChange = (newFilters) => {
-    setFilters(prev => ({
-      ...prev,
-      ...newFilters,
-      pagina: 1 // Reset page when filters change
-    }));
-  };
+  useEffect(() => () => clearTimeout(retryTimer.current), []);
+
+  const handleFilterChange = useCallback((newFilters) => {
+    setFilters(prev => {
+      const unchanged = prev.pagina === 1 &&
+        Object.entries(newFilters).every(([key, value]) => prev[key] === value);
+      if (unchanged) return prev;
+      return {
+        ...prev,
+        ...newFilters,
+        pagina: 1 // Reset page when filters change
+      };
+    });
+  }, []);
 
   const handleLoadMore = () => {
     setFilters(prev => ({
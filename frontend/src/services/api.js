@@ -49,12 +49,35 @@ export const radioAPI = {
     return response.data;
   },
 
+  // Get a page of radios plus the total number of matches
+  getRadiosPage: async (filters = {}) => {
+    const params = new URLSearchParams({ incluir_total: 'true' });
+    
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== null && value !== undefined && value !== '') {
+        params.append(key, value);
+      }
+    });
+    
+    const response = await api.get(`/radios?${params}`);
+    return {
+      radios: response.data,
+      total: parseInt(response.headers['x-total-count'], 10),
+    };
+  },
+
   // Get radio by ID
   getRadio: async (id) => {
     const response = await api.get(`/radios/${id}`);
     return response.data;
   },
 
+  // Get several radios by ID, in the given order
+  getRadiosByIds: async (ids) => {
+    const response = await api.post('/radios/por-ids', { ids });
+    return response.data;
+  },
+
   // Create new radio (admin only)
   createRadio: async (radioData) => {
     const response = await api.post('/radios', radioData);
@@ -114,6 +137,23 @@ export const radioAPI = {
   getStats: async () => {
     const response = await api.get('/stats');
     return response.data;
+  },
+
+  // Get search suggestions
+  getSugestoes: async (q, limite = 8) => {
+    const response = await api.get('/sugestoes', { params: { q, limite } });
+    return response.data;
+  },
+
+  // Subscribe to catalog changes (create, update, delete, logo, reset)
+  subscribeChanges: (onChange) => {
+    const source = new EventSource(`${API_BASE}/radios/alteracoes`);
+    ['create', 'update', 'delete', 'logo', 'reset'].forEach((type) => {
+      source.addEventListener(type, (event) => {
+        onChange({ ...JSON.parse(event.data), tipo: type });
+      });
+    });
+    return () => source.close();
   }
 };
 
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# server.py vive em backend/ e não é um pacote
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+from pymongo.errors import OperationFailure
+
+import server
+from server import RadioChangeFeed, change_to_event
+
+
+RADIO = {
+    "id": "r1",
+    "nome": "Rádio Teste",
+    "descricao": "Descrição",
+    "stream_url": "https://example.com/stream",
+    "genero": "Pop",
+    "regiao": "Sudeste",
+    "cidade": "São Paulo",
+    "estado": "SP",
+}
+
+
+def test_eventos_apos_returns_only_later_events():
+    feed = RadioChangeFeed()
+    for tipo in ("create", "update", "delete"):
+        feed.publicar({"tipo": tipo, "radio_id": "r1", "dados": None})
+    primeiro = feed.buffer[0]["id"]
+
+    assert [e["tipo"] for e in feed.eventos_apos(primeiro)] == ["update", "delete"]
+    assert feed.eventos_apos(feed.buffer[-1]["id"]) == []
+
+
+def test_eventos_apos_unknown_or_evicted_id_returns_none():
+    feed = RadioChangeFeed(tamanho_buffer=2)
+    for _ in range(3):
+        feed.publicar({"tipo": "update", "radio_id": "r1", "dados": None})
+
+    assert feed.eventos_apos(f"{feed.prefixo}-1") is None
+    assert feed.eventos_apos("outro-processo-2") is None
+
+
+def test_slow_subscriber_is_dropped_after_last_delivered_event():
+    async def cenario():
+        feed = RadioChangeFeed(tamanho_fila=2)
+        lenta = feed.assinar()
+        for _ in range(3):
+            feed.publicar({"tipo": "update", "radio_id": "r1", "dados": None})
+        return feed, [lenta.get_nowait() for _ in range(lenta.qsize())], lenta
+
+    feed, recebidos, lenta = asyncio.run(cenario())
+
+    assert lenta not in feed.assinantes
+    assert recebidos[-1] is None
+    # O cliente retoma a partir do último evento entregue sem perder nenhum
+    ultimo = recebidos[-2]["id"]
+    assert [e["id"] for e in feed.eventos_apos(ultimo)] == [feed.buffer[-1]["id"]]
+
+
+def test_failing_listener_does_not_break_publish():
+    feed = RadioChangeFeed()
+    feed.ouvintes.append(lambda evento: 1 / 0)
+    feed.publicar({"tipo": "update", "radio_id": "r1", "dados": None})
+
+    assert len(feed.buffer) == 1
+
+
+def test_change_to_event_maps_logo_update():
+    change = {
+        "_id": {"_data": "t1"},
+        "operationType": "update",
+        "documentKey": {"_id": "oid1"},
+        "fullDocument": {**RADIO, "logo_url": "/uploads/x.png"},
+        "updateDescription": {"updatedFields": {"logo_url": "/uploads/x.png"}},
+    }
+
+    evento = change_to_event(change)
+
+    assert evento["tipo"] == "logo"
+    assert evento["radio_id"] == "r1"
+    assert evento["dados"]["logo_url"] == "/uploads/x.png"
+
+
+def test_change_to_event_skips_invalid_document():
+    change = {
+        "_id": {"_data": "t1"},
+        "operationType": "insert",
+        "documentKey": {"_id": "oid2"},
+        "fullDocument": {"id": "r2", "nome": "Sem gênero"},
+    }
+
+    assert change_to_event(change) is None
+
+
+class FakeCursor:
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+
+class FakeStream:
+    def __init__(self, erro):
+        self.erro = erro
+
+    async def __aenter__(self):
+        raise self.erro
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeRadios:
+    def __init__(self, erro):
+        self.erro = erro
+        self.aberturas = 0
+
+    def find(self, *args, **kwargs):
+        return FakeCursor()
+
+    def watch(self, **kwargs):
+        self.aberturas += 1
+        return FakeStream(self.erro)
+
+
+class FakeDB:
+    def __init__(self, erro):
+        self.radios = FakeRadios(erro)
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    def instalar(erro):
+        banco = FakeDB(erro)
+        monkeypatch.setattr(server, "db", banco)
+        return banco
+    return instalar
+
+
+def test_watcher_falls_back_only_when_change_streams_unsupported(fake_db):
+    fake_db(OperationFailure("not a replica set", code=40573))
+    server.radio_changes.mongo_ativo = True
+
+    asyncio.run(asyncio.wait_for(server.watch_radio_changes(), timeout=1))
+
+    assert server.radio_changes.mongo_ativo is False
+
+
+def test_watcher_retries_other_operation_failures(fake_db):
+    banco = fake_db(OperationFailure("interrupted", code=11602))
+
+    async def cenario():
+        tarefa = asyncio.create_task(server.watch_radio_changes())
+        await asyncio.sleep(0.05)
+        assert not tarefa.done()
+        tarefa.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tarefa
+
+    asyncio.run(cenario())
+
+    assert banco.radios.aberturas == 1
+    assert server.radio_changes.mongo_ativo is False
+
+
+def test_watcher_survives_unexpected_errors(fake_db):
+    fake_db(RuntimeError("bug"))
+
+    async def cenario():
+        tarefa = asyncio.create_task(server.watch_radio_changes())
+        await asyncio.sleep(0.05)
+        assert not tarefa.done()
+        tarefa.cancel()
+
+    asyncio.run(cenario())
+
+
+def test_delete_resolves_id_and_forgets_oid():
+    insert = {
+        "_id": {"_data": "t1"},
+        "operationType": "insert",
+        "documentKey": {"_id": "oid-del"},
+        "fullDocument": {**RADIO, "id": "r-del"},
+    }
+    delete = {"_id": {"_data": "t2"}, "operationType": "delete", "documentKey": {"_id": "oid-del"}}
+
+    change_to_event(insert)
+    evento = change_to_event(delete)
+
+    assert evento == {"tipo": "delete", "radio_id": "r-del", "dados": None}
+    assert "oid-del" not in server.radio_ids_por_oid
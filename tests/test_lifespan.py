@@ -0,0 +1,48 @@
+import asyncio
+from types import SimpleNamespace
+
+import server
+
+
+class FakeClient:
+    def __init__(self, eventos):
+        self.eventos = eventos
+
+    def __getitem__(self, nome):
+        return SimpleNamespace()
+
+    def get_database(self, nome, **kwargs):
+        return SimpleNamespace()
+
+    def close(self):
+        self.eventos.append("close")
+
+
+def test_shutdown_waits_for_background_tasks_before_closing_client(monkeypatch):
+    eventos = []
+
+    def tarefa_longa(nome):
+        async def executar(*args):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                # Simula o fechamento de um cursor durante o cancelamento
+                await asyncio.sleep(0)
+                eventos.append(f"{nome} encerrada")
+                raise
+        return executar
+
+    monkeypatch.setattr(server, "AsyncIOMotorClient", lambda *args, **kwargs: FakeClient(eventos))
+    monkeypatch.setattr(server, "warm_up", tarefa_longa("aquecimento"))
+    monkeypatch.setattr(server, "watch_radio_changes", tarefa_longa("watcher"))
+    monkeypatch.setenv("WARMUP_TIMEOUT_S", "0")
+    app = SimpleNamespace(state=SimpleNamespace())
+
+    async def cenario():
+        async with server.lifespan(app):
+            await asyncio.sleep(0)
+
+    asyncio.run(cenario())
+
+    assert eventos[-1] == "close"
+    assert sorted(eventos[:-1]) == ["aquecimento encerrada", "watcher encerrada"]
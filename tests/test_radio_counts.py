@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from fastapi import Response
+
+import server
+
+
+class FakeCursor:
+    def skip(self, _):
+        return self
+
+    def limit(self, _):
+        return self
+
+    async def to_list(self, length):
+        return []
+
+
+class FakeRadios:
+    def __init__(self):
+        self.contagens = []
+
+    def find(self, filtros):
+        return FakeCursor()
+
+    async def count_documents(self, filtros):
+        self.contagens.append(filtros)
+        return 7
+
+
+class FakeDB:
+    def __init__(self):
+        self.radios = FakeRadios()
+
+
+@pytest.fixture
+def fake_catalog(monkeypatch):
+    banco = FakeDB()
+    monkeypatch.setattr(server, "catalog_db", banco)
+    server.radio_count_cache.clear()
+    return banco
+
+
+def test_active_only_listing_uses_cached_stats(fake_catalog, monkeypatch):
+    async def fake_stats():
+        return {"total_radios": 42}
+    monkeypatch.setattr(server, "get_stats", fake_stats)
+
+    total = asyncio.run(server.count_radios({"ativo": True}, (True, None, None, None, None, None)))
+
+    assert total == 42
+    assert fake_catalog.radios.contagens == []
+
+
+def test_filtered_count_is_cached_per_key(fake_catalog):
+    filtros = {"ativo": True, "genero": "Pop"}
+    chave = (True, "Pop", None, None, None, None)
+
+    async def contar_duas_vezes():
+        return [await server.count_radios(filtros, chave) for _ in range(2)]
+
+    assert asyncio.run(contar_duas_vezes()) == [7, 7]
+    assert fake_catalog.radios.contagens == [filtros]
+
+
+def test_regex_class_case_is_not_folded_into_the_key(fake_catalog):
+    async def listar(busca):
+        resposta = Response()
+        await server.get_radios(
+            resposta, busca=busca, genero=None, regiao=None, cidade=None, estado=None,
+            ativo=True, limite=10, pagina=1, incluir_total=True
+        )
+        return resposta.headers["X-Total-Count"]
+
+    async def cenario():
+        return [await listar(r"\S"), await listar(r"\s")]
+
+    assert asyncio.run(cenario()) == ["7", "7"]
+    assert len(fake_catalog.radios.contagens) == 2
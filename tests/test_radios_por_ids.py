@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from server import RadioIdsRequest
+
+
+class FakeCursor:
+    def __init__(self, documentos):
+        self.documentos = documentos
+
+    async def to_list(self, length):
+        return self.documentos
+
+
+class FakeRadios:
+    def __init__(self, documentos):
+        self.documentos = documentos
+        self.consultas = []
+
+    def find(self, filtro):
+        self.consultas.append(filtro)
+        ids = set(filtro["id"]["$in"])
+        return FakeCursor([d for d in self.documentos if d["id"] in ids])
+
+
+def radio(radio_id, ativo=True):
+    return {
+        "id": radio_id, "nome": f"Rádio {radio_id}", "descricao": "x", "stream_url": "https://x",
+        "genero": "Pop", "regiao": "Sul", "cidade": "Curitiba", "estado": "PR", "ativo": ativo,
+    }
+
+
+@pytest.fixture
+def catalogo(monkeypatch):
+    radios = FakeRadios([radio("a"), radio("b"), radio("c", ativo=False)])
+    monkeypatch.setattr(server, "catalog_db", type("DB", (), {"radios": radios})())
+    return radios
+
+
+def test_returns_requested_order_and_reports_missing_and_inactive(catalogo):
+    resposta = asyncio.run(server.post_radios_por_ids(RadioIdsRequest(ids=["b", "x", "a", "c", "b"])))
+
+    assert [r.id for r in resposta.radios] == ["b", "a"]
+    assert resposta.nao_encontradas == ["x"]
+    assert resposta.inativas == ["c"]
+    assert len(catalogo.consultas) == 1
+
+
+def test_get_and_post_share_the_check_after_removing_duplicates(catalogo):
+    repetidos = ["a"] * 400
+    assert asyncio.run(server.post_radios_por_ids(RadioIdsRequest(ids=repetidos))).radios[0].id == "a"
+    assert asyncio.run(server.get_radios_por_ids(",".join(repetidos))).radios[0].id == "a"
+
+
+@pytest.mark.parametrize("chamar, quantidade", [
+    (lambda ids: server.post_radios_por_ids(RadioIdsRequest(ids=ids)), server.MAX_IDS_POR_LOTE + 1),
+    (lambda ids: server.get_radios_por_ids(",".join(ids)), server.MAX_IDS_POR_GET + 1),
+])
+def test_too_many_ids_is_400_for_both_methods(catalogo, chamar, quantidade):
+    with pytest.raises(HTTPException) as erro:
+        asyncio.run(chamar([f"id-{i}" for i in range(quantidade)]))
+
+    assert erro.value.status_code == 400
+
+
+def test_get_error_points_to_post_for_large_batches(catalogo):
+    with pytest.raises(HTTPException) as erro:
+        asyncio.run(server.get_radios_por_ids(",".join(f"id-{i}" for i in range(60))))
+
+    assert "POST" in erro.value.detail
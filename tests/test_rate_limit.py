@@ -0,0 +1,142 @@
+import asyncio
+import ipaddress
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+import server
+from server import RateLimiter
+
+
+class Relogio:
+    def __init__(self):
+        self.agora = 1000.0
+
+    def monotonic(self):
+        return self.agora
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    relogio = Relogio()
+    monkeypatch.setattr(server, "time", SimpleNamespace(monotonic=relogio.monotonic))
+    return relogio
+
+
+def make_request(path="/api/radios", query="", client="203.0.113.9", headers=None):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": (client, 1234),
+    })
+
+
+def test_rejects_after_burst_with_time_until_next_token(relogio):
+    limite = RateLimiter(taxa=2, capacidade=3)
+
+    assert [limite.consumir("ip") for _ in range(3)] == [0, 0, 0]
+    assert limite.consumir("ip") == pytest.approx(0.5)
+    assert limite.rejeitadas == 1
+
+
+def test_refills_over_time_up_to_capacity(relogio):
+    limite = RateLimiter(taxa=2, capacidade=3)
+    for _ in range(3):
+        limite.consumir("ip")
+
+    relogio.agora += 0.5
+    assert limite.consumir("ip") == 0
+    assert limite.consumir("ip") > 0
+
+    relogio.agora += 60
+    assert [limite.consumir("ip") for _ in range(3)] == [0, 0, 0]
+    assert limite.consumir("ip") > 0
+
+
+def test_keys_have_independent_buckets(relogio):
+    limite = RateLimiter(taxa=1, capacidade=1)
+
+    assert limite.consumir("a") == 0
+    assert limite.consumir("b") == 0
+    assert limite.consumir("a") > 0
+
+
+def test_forwarded_for_ignored_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(server, "trusted_proxies", [])
+    request = make_request(headers={"X-Forwarded-For": "1.2.3.4"})
+
+    assert server.client_ip(request) == "203.0.113.9"
+
+
+def test_forwarded_for_uses_rightmost_untrusted_hop(monkeypatch):
+    monkeypatch.setattr(server, "trusted_proxies", [ipaddress.ip_network("10.0.0.0/8")])
+    request = make_request(
+        client="10.0.0.2",
+        headers={"X-Forwarded-For": "6.6.6.6, 198.51.100.7, 10.0.0.1"},
+    )
+
+    assert server.client_ip(request) == "198.51.100.7"
+
+
+async def call_next(request):
+    return PlainTextResponse("ok")
+
+
+def test_ip_limits_are_off_without_trusted_proxies_in_auto_mode(monkeypatch):
+    monkeypatch.setattr(server, "limitar_por_ip", False)
+    monkeypatch.setattr(server, "ip_rate_limiter", RateLimiter(taxa=1, capacidade=1))
+    monkeypatch.setattr(server, "busca_rate_limiter", RateLimiter(taxa=1, capacidade=1))
+
+    async def cenario():
+        return [await server.rate_limit(make_request(query="busca=abc"), call_next) for _ in range(3)]
+
+    assert [r.status_code for r in asyncio.run(cenario())] == [200, 200, 200]
+
+
+def test_spoofed_forwarded_for_does_not_reset_the_bucket(monkeypatch):
+    monkeypatch.setattr(server, "trusted_proxies", [])
+    monkeypatch.setattr(server, "limitar_por_ip", True)
+    monkeypatch.setattr(server, "ip_rate_limiter", RateLimiter(taxa=100, capacidade=100))
+    monkeypatch.setattr(server, "busca_rate_limiter", RateLimiter(taxa=0.5, capacidade=2))
+
+    async def buscar():
+        request = make_request(query="busca=abc", headers={"X-Forwarded-For": str(uuid.uuid4())})
+        return await server.rate_limit(request, call_next)
+
+    async def cenario():
+        return [await buscar() for _ in range(3)]
+
+    respostas = asyncio.run(cenario())
+
+    assert [r.status_code for r in respostas] == [200, 200, 429]
+    assert respostas[-1].headers["Retry-After"] == "2"
+    assert len(server.busca_rate_limiter.baldes) == 1
+
+
+def test_bucket_table_stays_bounded(relogio):
+    limite = RateLimiter(taxa=1, capacidade=2, max_chaves=10)
+
+    for i in range(100):
+        limite.consumir(f"ip-{i}")
+
+    assert len(limite.baldes) <= 10
+    assert "ip-99" in limite.baldes
+
+
+def test_default_busca_budget_allows_one_person_typing(relogio):
+    padrao = server.busca_rate_limiter
+    limite = RateLimiter(taxa=padrao.taxa, capacidade=padrao.capacidade)
+
+    # Cada prefixo de "radio globo" a ~5 teclas por segundo, mesmo sem debounce
+    resultados = []
+    for _ in "radio globo":
+        resultados.append(limite.consumir("203.0.113.9"))
+        relogio.agora += 0.2
+
+    assert resultados == [0] * len("radio globo")
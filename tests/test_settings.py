@@ -0,0 +1,21 @@
+import pytest
+from pymongo import ReadPreference
+
+from server import parse_read_preference
+
+
+@pytest.mark.parametrize("nome, esperado", [
+    ("primary", ReadPreference.PRIMARY),
+    ("primaryPreferred", ReadPreference.PRIMARY_PREFERRED),
+    ("secondary", ReadPreference.SECONDARY),
+    ("secondaryPreferred", ReadPreference.SECONDARY_PREFERRED),
+    ("nearest", ReadPreference.NEAREST),
+])
+def test_parses_mongodb_mode_names(nome, esperado):
+    assert parse_read_preference(nome) == esperado
+
+
+@pytest.mark.parametrize("nome", ["SECONDARYPREFERRED", "secondary_preferred", "replica", ""])
+def test_rejects_unknown_mode_names(nome):
+    with pytest.raises(ValueError, match="MONGO_CATALOG_READ_PREFERENCE"):
+        parse_read_preference(nome)
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from server import SingleFlight, db_admission
+
+
+def test_concurrent_identical_calls_run_once():
+    chamadas = []
+
+    async def consulta():
+        chamadas.append(1)
+        await asyncio.sleep(0.01)
+        return {"total": 3}
+
+    async def cenario():
+        flight = SingleFlight()
+        resultados = await asyncio.gather(
+            flight.executar("stats", (), consulta),
+            flight.executar("stats", (), consulta),
+            flight.executar("radio", ("r1",), consulta),
+        )
+        return flight, resultados
+
+    flight, resultados = asyncio.run(cenario())
+
+    assert len(chamadas) == 2
+    assert resultados[0] is resultados[1]
+    assert flight.metricas() == {
+        "stats": {"chamadas": 2, "coalescidas": 1},
+        "radio": {"chamadas": 1, "coalescidas": 0},
+    }
+    assert flight.em_andamento == {}
+    assert db_admission.em_andamento == 0
+
+
+def test_failure_is_shared_and_slot_released():
+    async def consulta():
+        await asyncio.sleep(0.01)
+        raise ValueError("falhou")
+
+    async def cenario():
+        flight = SingleFlight()
+        return await asyncio.gather(
+            flight.executar("radios", (1,), consulta),
+            flight.executar("radios", (1,), consulta),
+            return_exceptions=True,
+        )
+
+    resultados = asyncio.run(cenario())
+
+    assert all(isinstance(r, ValueError) for r in resultados)
+    assert db_admission.em_andamento == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_query():
+    async def consulta():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def cenario():
+        flight = SingleFlight()
+        primeiro = asyncio.create_task(flight.executar("radio", ("r1",), consulta))
+        segundo = asyncio.create_task(flight.executar("radio", ("r1",), consulta))
+        await asyncio.sleep(0)
+        primeiro.cancel()
+        assert await segundo == "ok"
+        with pytest.raises(asyncio.CancelledError):
+            await primeiro
+
+    asyncio.run(cenario())
+
+    assert db_admission.em_andamento == 0
+
+
+def test_cancelled_query_releases_slot():
+    async def cenario():
+        flight = SingleFlight()
+        chamador = asyncio.create_task(flight.executar("radio", ("r1",), lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        assert db_admission.em_andamento == 1
+        flight.em_andamento[("radio", "r1")].cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await chamador
+        assert flight.em_andamento == {}
+
+    asyncio.run(cenario())
+
+    assert db_admission.em_andamento == 0
@@ -0,0 +1,147 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import server
+from server import SuggestionIndex, normalize_text
+
+
+def radio(radio_id, nome, cidade="São Paulo", estado="SP", ativo=True):
+    return {"id": radio_id, "nome": nome, "cidade": cidade, "estado": estado, "ativo": ativo}
+
+
+def build_index(*radios):
+    indice = SuggestionIndex()
+    indice.carregado = True
+    for item in radios:
+        indice.adicionar(item)
+    return indice
+
+
+def valores(sugestoes):
+    return [s["valor"] for s in sugestoes]
+
+
+def test_normalize_text_folds_accents_and_case():
+    assert normalize_text("  São PAULO ") == "sao paulo"
+    assert normalize_text("Rádio Clássica") == "radio classica"
+
+
+def test_prefix_matches_without_accents_and_inside_words():
+    indice = build_index(radio("1", "Rádio Paulista", cidade="Goiânia", estado="GO"))
+
+    assert valores(indice.sugerir("goi", 5)) == ["Goiânia"]
+    assert valores(indice.sugerir("PAUL", 5)) == ["Rádio Paulista"]
+    assert indice.sugerir("xyz", 5) == []
+
+
+def test_popular_station_wins_over_alphabetical_order():
+    radios = [radio(f"a{i}", f"Rádio A{i:04d}", cidade="Cidade", estado="XX") for i in range(1200)]
+    indice = build_index(*radios, radio("zeta", "Rádio Zeta", cidade="Cidade", estado="XX"))
+    for _ in range(10000):
+        indice.registrar_acesso("zeta")
+
+    assert indice.sugerir("radio", 5)[0] == {"tipo": "radio", "valor": "Rádio Zeta", "radio_id": "zeta"}
+
+
+def test_cities_are_weighted_by_station_count():
+    indice = build_index(
+        radio("1", "Um", cidade="Santos"),
+        radio("2", "Dois", cidade="São Paulo"),
+        radio("3", "Três", cidade="São Paulo"),
+    )
+
+    assert valores(indice.sugerir("sa", 2)) == ["São Paulo", "Santos"]
+
+
+def test_incremental_update_deactivate_and_delete():
+    indice = build_index(radio("1", "Jovem Pan", cidade="Santos"), radio("2", "Band", cidade="Santos"))
+
+    indice.aplicar_evento({"tipo": "update", "radio_id": "1", "dados": radio("1", "Nova Pan", cidade="Santos")})
+    assert valores(indice.sugerir("jovem", 5)) == []
+    assert valores(indice.sugerir("nova", 5)) == ["Nova Pan"]
+
+    indice.aplicar_evento({"tipo": "update", "radio_id": "2", "dados": radio("2", "Band", cidade="Santos", ativo=False)})
+    assert valores(indice.sugerir("band", 5)) == []
+    assert indice.contagem[("cidade", "Santos")] == 1
+
+    indice.aplicar_evento({"tipo": "delete", "radio_id": "1"})
+    assert indice.sugerir("s", 5) == []
+    assert indice.entradas == [] and indice.chaves == []
+
+
+def brute_force(indice, termo, limite):
+    prefixo = normalize_text(termo)
+    candidatos = {}
+    for chave, tipo, valor, radio_id, inicio in indice.entradas:
+        if chave.startswith(prefixo):
+            peso = indice._peso(tipo, valor, radio_id, inicio)
+            candidatos[(tipo, valor, radio_id)] = max(peso, candidatos.get((tipo, valor, radio_id), 0))
+    return [item for item, _ in sorted(candidatos.items(), key=lambda c: (-c[1], len(c[0][1]), c[0][1]))[:limite]]
+
+
+def as_items(sugestoes):
+    return [(s["tipo"], s["valor"], s["radio_id"] or "") for s in sugestoes]
+
+
+def test_precomputed_prefixes_match_full_ranking():
+    rng = random.Random(7)
+    radios = [
+        radio(f"r{i}", f"Rádio {rng.choice(['Globo', 'Band', 'Nova', 'Rio'])} {i} FM",
+              cidade=f"Cidade {rng.randrange(40)}", estado=rng.choice(["SP", "RJ", "MG"]))
+        for i in range(600)
+    ]
+    indice = SuggestionIndex(limiar_precalculo=8)
+    indice.carregado = True
+    for i in range(0, 600, 5):
+        indice.acessos[f"r{i}"] = rng.randrange(50)
+    indice.reconstruir(radios)
+    assert indice.top_prefixos
+
+    prefixos = ["r", "ra", "radio", "radio g", "fm", "c", "cidade 1", "s", "n", "1"]
+    for termo in prefixos:
+        assert as_items(indice.sugerir(termo, 8)) == brute_force(indice, termo, 8), termo
+
+    # Alterações invalidam os prefixos afetados, que são refeitos na próxima consulta
+    indice.adicionar(radio("novo", "Rádio Nova Era FM", cidade="Cidade 1"))
+    indice.acessos["novo"] = 1000
+    indice.remover("r0")
+    indice.adicionar(radio("r5", "Band News", cidade="Santos", ativo=False))
+    for termo in prefixos + ["band"]:
+        assert as_items(indice.sugerir(termo, 8)) == brute_force(indice, termo, 8), termo
+    assert as_items(indice.sugerir("radio", 1)) == [("radio", "Rádio Nova Era FM", "novo")]
+
+
+class FakeCursor:
+    def __init__(self, radios):
+        self.radios = radios
+
+    async def to_list(self, length):
+        return list(self.radios)
+
+
+class FakeCatalog:
+    def __init__(self, radios):
+        self.radios = SimpleNamespace(find=lambda *args: FakeCursor(radios))
+
+
+def test_reload_picks_up_changes_made_elsewhere(monkeypatch):
+    catalogo = [radio("1", "Jovem Pan")]
+    monkeypatch.setattr(server, "catalog_db", FakeCatalog(catalogo))
+    indice = SuggestionIndex(recarregar_apos=60)
+
+    async def cenario():
+        await indice.carregar()
+        # Outro worker cria uma rádio e remove outra; nenhum evento chega aqui
+        catalogo[:] = [radio("2", "Jornal FM")]
+        indice.agendar_recarga()
+        assert indice.recarga is None
+
+        indice.carregado_em -= 61
+        indice.agendar_recarga()
+        await indice.recarga
+
+    asyncio.run(cenario())
+
+    assert valores(indice.sugerir("jo", 5)) == ["Jornal FM"]
+    assert list(indice.radios) == ["2"]
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+import server
+
+
+class FakeAdmin:
+    def __init__(self, falhas=0):
+        self.falhas = falhas
+
+    async def command(self, nome):
+        if self.falhas:
+            self.falhas -= 1
+            raise AutoReconnect("sem conexão")
+        return {"ok": 1}
+
+
+class FakeRadios:
+    def __init__(self, erro_indice=None):
+        self.erro_indice = erro_indice
+
+    async def create_index(self, campo):
+        if self.erro_indice:
+            raise self.erro_indice
+        return "id_1"
+
+
+class Parar(Exception):
+    """Interrompe o laço de backoff nos testes"""
+
+
+@pytest.fixture
+def ambiente(monkeypatch):
+    def instalar(falhas_ping=0, erro_indice=None, falhas_customizacao=0, max_esperas=None):
+        monkeypatch.setattr(server, "client", SimpleNamespace(admin=FakeAdmin(falhas_ping)))
+        monkeypatch.setattr(server, "db", SimpleNamespace(radios=FakeRadios(erro_indice)))
+        monkeypatch.setattr(server, "mongo_options", {"minPoolSize": 1})
+        estado = SimpleNamespace(pronto=False, erros_aquecimento={})
+        app = SimpleNamespace(state=estado)
+        esperas = []
+        restantes = {"customizacao": falhas_customizacao}
+
+        async def customizacao():
+            if restantes["customizacao"]:
+                restantes["customizacao"] -= 1
+                raise ValueError("documento inválido")
+
+        async def nada():
+            return None
+
+        async def dormir(segundos):
+            # Registra o backoff e o estado do worker enquanto o passo ainda está falhando
+            esperas.append((segundos, estado.pronto, dict(estado.erros_aquecimento)))
+            if max_esperas is not None and len(esperas) >= max_esperas:
+                raise Parar()
+
+        monkeypatch.setattr(server, "get_customization", customizacao)
+        monkeypatch.setattr(server, "get_stats", nada)
+        monkeypatch.setattr(server.suggestion_index, "carregar", nada)
+        monkeypatch.setattr(server.asyncio, "sleep", dormir)
+        return app, esperas
+    return instalar
+
+
+def test_retries_connection_until_ready(ambiente):
+    app, esperas = ambiente(falhas_ping=2)
+
+    asyncio.run(server.warm_up(app))
+
+    assert app.state.pronto is True
+    assert app.state.erros_aquecimento == {}
+    assert [segundos for segundos, _, _ in esperas] == [1, 2]
+    assert not any(pronto for _, pronto, _ in esperas)
+
+
+def test_existing_index_with_other_options_is_tolerated(ambiente):
+    app, _ = ambiente(erro_indice=OperationFailure("conflito", code=85))
+
+    asyncio.run(server.warm_up(app))
+
+    assert app.state.pronto is True
+    assert app.state.erros_aquecimento == {}
+
+
+def test_cache_failure_does_not_block_readiness_and_is_retried(ambiente):
+    app, esperas = ambiente(falhas_customizacao=2)
+
+    asyncio.run(server.warm_up(app))
+
+    # Pronto já na primeira rodada, com o erro visível enquanto o passo falha
+    assert esperas[0][1] is True
+    assert esperas[0][2] == {"customizacao": "ValueError: documento inválido"}
+    assert [segundos for segundos, _, _ in esperas] == [2, 4]
+    assert app.state.erros_aquecimento == {}
+
+
+def test_permanent_failure_keeps_retrying_with_capped_backoff(ambiente):
+    app, esperas = ambiente(
+        erro_indice=OperationFailure("not authorized", code=13), max_esperas=10
+    )
+
+    with pytest.raises(Parar):
+        asyncio.run(server.warm_up(app))
+
+    assert app.state.pronto is True
+    assert "OperationFailure" in app.state.erros_aquecimento["indices"]
+    assert [segundos for segundos, _, _ in esperas] == [2, 4, 8, 16, 32, 64, 128, 256, 300, 300]
+
+
+def test_readiness_reports_warm_up_errors_but_stays_ready(ambiente, monkeypatch):
+    ambiente()
+    monkeypatch.setattr(server.app.state, "pronto", True, raising=False)
+    monkeypatch.setattr(server.app.state, "erros_aquecimento", {"indices": "OperationFailure: x"}, raising=False)
+
+    resposta = asyncio.run(server.readiness_check())
+    corpo = json.loads(resposta.body)
+
+    assert resposta.status_code == 200
+    assert corpo["caches_aquecidos"] is False
+    assert corpo["erros_aquecimento"] == {"indices": "OperationFailure: x"}
+
+
+def test_readiness_fails_without_database(ambiente, monkeypatch):
+    ambiente(falhas_ping=1)
+    monkeypatch.setattr(server.app.state, "pronto", True, raising=False)
+    monkeypatch.setattr(server.app.state, "erros_aquecimento", {}, raising=False)
+
+    resposta = asyncio.run(server.readiness_check())
+
+    assert resposta.status_code == 503
+    assert json.loads(resposta.body)["database"]["ok"] is False